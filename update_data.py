@@ -17,15 +17,19 @@ provide a valid API key via the environment variable `FINNHUB_API_KEY`.
 The script performs the following steps:
 
 1.  **Load S&P 500 constituents**:  Pulls the list of ticker symbols and
-    company names from the Wikipedia page for the S&P 500 index using
-    `pandas.read_html`.  This keeps the list current without maintaining a
-    local copy.
+    company names from the Wikipedia page for the S&P 500 index, reading
+    the constituents table directly with `lxml`.  This keeps the list current
+    without maintaining a local copy.
 2.  **Fetch quote and earnings data**:  For each symbol, it requests the
     latest quote (`/quote`) and the most recent earnings surprise record
-    (`/stock/earnings`) from Finnhub.  A company is considered to have a
-    "good earnings" if the actual EPS and revenue both exceed the analysts’
-    estimates.  Finnhub’s earnings endpoint returns a list of objects
-    containing `actual`, `estimate` and `revenueActual`, `revenueEstimate`.
+    (`/stock/earnings`) from Finnhub.  The requests are issued concurrently
+    with `asyncio` and an HTTP/2 `httpx` client, bounded by `MAX_CONCURRENCY`.
+    Responses are cached in a SQLite database under `~/.cache/us-stock-info`
+    so unchanged data is not requested again on the next run.  A company is
+    considered to have a "good earnings" if the actual EPS and revenue both
+    exceed the analysts’ estimates.  Finnhub’s earnings endpoint returns a
+    list of objects containing `actual`, `estimate` and `revenueActual`,
+    `revenueEstimate`.
 3.  **Filter for good earnings**:  Only companies meeting the criteria are
     retained.  This significantly reduces the size of the HTML table and
     makes it easier for investors to focus on strong performers.
@@ -47,192 +51,514 @@ Note:  The script assumes it is executed from the repository root and
 writes the generated HTML into the `site` directory as `index.html`.
 """
 
-import json
+import asyncio
+import functools
+import operator
 import os
-from datetime import datetime
-from typing import List, Dict
+import random
+import sqlite3
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html import escape
+from typing import List, Dict, NamedTuple, Tuple
 
-import pandas as pd
-import requests
+import httpx
+import lxml.html
+import orjson
 
 
 API_BASE = "https://finnhub.io/api/v1"
 
+# Maximum number of Finnhub requests in flight at any one time.  Each symbol
+# holds one semaphore slot for its two requests.  This bounds concurrency
+# only; the request rate is bounded separately by MAX_REQUESTS_PER_SECOND.
+MAX_CONCURRENCY = 50
+# Finnhub rejects more than 30 API calls per second.  Request start times are
+# spaced out to stay within this ceiling; retries count against it too.
+MAX_REQUESTS_PER_SECOND = 30
+# HTTP/2 multiplexes concurrent requests over a few connections, so the pool
+# can be much smaller than the number of requests in flight.
+MAX_CONNECTIONS = 20
+# Idle connections are kept open this long (seconds) so the TLS handshake is
+# paid once per connection rather than once per request.
+KEEPALIVE_TIMEOUT = 30
+REQUEST_TIMEOUT = 10
+# Rate-limited (429) and transient server errors, as well as transport errors,
+# are retried rather than silently dropping the symbol from the table.  The
+# wait honours the server's `Retry-After` header; otherwise it is a random
+# "full jitter" delay of up to RETRY_BACKOFF * 2**attempt seconds, so symbols
+# throttled together do not all retry at the same moment.  Waits are capped
+# at MAX_RETRY_DELAY, which is long enough to outlast a per-minute quota.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 5
+RETRY_BACKOFF = 1.0
+MAX_RETRY_DELAY = 60
+
+# Responses are cached on disk so repeated runs skip data that cannot have
+# changed yet.  Constituents change monthly and earnings quarterly, so those
+# are kept for a week.  Quotes are kept for an hour: that is long enough to
+# resume a failed run, but well below the daily schedule in
+# `.github/workflows/update.yml`, so a scheduled run never publishes the
+# previous day's prices.  Each response is stored in a SQLite database as
+# soon as it arrives, so a run that fails midway resumes from where it
+# stopped.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "us-stock-info")
+CACHE_DB = os.path.join(CACHE_DIR, "fetch_cache.sqlite")
+SYMBOLS_TTL = 7 * 24 * 60 * 60
+CACHE_TTL = {
+    "quote": 60 * 60,
+    "stock/earnings": 7 * 24 * 60 * 60,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def cache_db() -> sqlite3.Connection:
+    """Open the cache database, creating it on first use.
+
+    The database runs in WAL mode with autocommit, so every write survives a
+    crash of the process without blocking concurrent readers.  With
+    `synchronous=NORMAL` the most recent writes may still be lost on power
+    failure; they are simply fetched again on the next run.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    db = sqlite3.connect(CACHE_DB, isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS cache ("
+        "key TEXT PRIMARY KEY, fetched_at REAL NOT NULL, body BLOB NOT NULL)"
+    )
+    return db
+
+
+def read_cache(key: str, ttl: float):
+    """Return the JSON cached under `key` if it is younger than `ttl`.
+
+    Missing, expired or undecodable entries all yield `None`.
+    """
+    row = cache_db().execute(
+        "SELECT fetched_at, body FROM cache WHERE key = ?", (key,)
+    ).fetchone()
+    if row is None or time.time() - row[0] >= ttl:
+        return None
+    try:
+        return orjson.loads(row[1])
+    except ValueError:
+        return None
+
+
+def write_cache(key: str, data) -> None:
+    """Store `data` as JSON under `key`, replacing any previous entry."""
+    cache_db().execute(
+        "INSERT OR REPLACE INTO cache (key, fetched_at, body) VALUES (?, ?, ?)",
+        (key, time.time(), orjson.dumps(data)),
+    )
+
 
-def get_sp500_symbols() -> List[Dict[str, str]]:
+def disk_cached(func):
+    """Cache the JSON returned by a Finnhub request on disk.
+
+    Entries are keyed by endpoint and symbol and expire according to
+    `CACHE_TTL`.  Failed requests raise and are therefore never cached.
+    """
+    @functools.wraps(func)
+    async def wrapper(client, endpoint: str, symbol: str, token: str):
+        key = f"{endpoint}:{symbol}"
+        data = read_cache(key, CACHE_TTL[endpoint])
+        if data is None:
+            data = await func(client, endpoint, symbol, token)
+            write_cache(key, data)
+        return data
+    return wrapper
+
+
+class RateLimiter:
+    """Space out request start times so at most `rate` start per second.
+
+    Each caller reserves the next free slot and sleeps until it arrives.  The
+    event loop is single-threaded and nothing is awaited between reading and
+    advancing the next slot, so no lock is needed.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self.next_slot = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+FINNHUB_RATE_LIMITER = RateLimiter(MAX_REQUESTS_PER_SECOND)
+
+
+def retry_delay(resp: httpx.Response, attempt: int) -> float:
+    """Return how many seconds to wait before retrying after `attempt`.
+
+    A `Retry-After` header on `resp`, given either in seconds or as an HTTP
+    date, is honoured.  Otherwise the delay is drawn uniformly from zero to
+    the exponential backoff for this attempt.  Either way it is capped at
+    `MAX_RETRY_DELAY`.
+    """
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(retry_after)
+                delay = (when - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0.0), MAX_RETRY_DELAY)
+    return random.uniform(0, min(RETRY_BACKOFF * 2 ** attempt, MAX_RETRY_DELAY))
+
+
+async def get_with_retries(
+    client: httpx.AsyncClient, url: str, limiter: RateLimiter = None, **kwargs
+) -> httpx.Response:
+    """Send a GET request, retrying transient failures.
+
+    Responses with a status in `RETRY_STATUSES` and transport errors such as
+    connect or read timeouts and connection resets are retried up to
+    `MAX_RETRIES` times, waiting as determined by `retry_delay`.  A transport
+    error on the last attempt is re-raised; otherwise the final response is
+    returned without checking its status.  If `limiter` is given, every
+    attempt waits for it before being sent.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        resp = None
+        if limiter is not None:
+            await limiter.wait()
+        try:
+            resp = await client.get(url, **kwargs)
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+        else:
+            if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return resp
+        await asyncio.sleep(retry_delay(resp, attempt))
+
+
+async def get_sp500_symbols(client: httpx.AsyncClient) -> List[Dict[str, str]]:
     """Return a list of dicts with S&P 500 ticker symbols and company names.
 
     The list of constituents is scraped from the Wikipedia page for the S&P 500
     index.  It contains the most up‑to‑date membership because Wikipedia is
     community‑maintained and regularly updated when companies enter or leave
     the index.  Each entry in the returned list has two keys: `symbol` and
-    `name`.
+    `name`.  The list is cached on disk for `SYMBOLS_TTL` seconds.  Once it
+    expires the page is requested conditionally with the ETag of the cached
+    copy, and a `304 Not Modified` response reuses the cached list without
+    downloading or parsing the page again.
     """
+    # An empty list is never valid, so it is treated as a cache miss.
+    symbols = read_cache("sp500_symbols", SYMBOLS_TTL)
+    if symbols:
+        return symbols
     url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-    # Read the first table on the page; it contains the index constituents.
-    tables = pd.read_html(url)
-    sp500_table = tables[0]
-    symbols = sp500_table[["Symbol", "Security"]].rename(
-        columns={"Symbol": "symbol", "Security": "name"}
-    )
-    return symbols.to_dict("records")
+    # Wikipedia rejects requests without a descriptive User-Agent.
+    headers = {"User-Agent": "us-stock-info/1.0 (update_data.py)"}
+    stale_symbols = read_cache("sp500_symbols", float("inf"))
+    etag = read_cache("wiki_etag", float("inf"))
+    if stale_symbols and etag:
+        headers["If-None-Match"] = etag
+    resp = await get_with_retries(client, url, headers=headers)
+    if resp.status_code == 304:
+        # Unchanged since the cached copy; rewrite it to restart its TTL.
+        write_cache("sp500_symbols", stale_symbols)
+        return stale_symbols
+    resp.raise_for_status()
+    tree = lxml.html.fromstring(resp.content)
+    # The constituents table is the first wikitable whose header row has
+    # "Symbol" and "Security" columns; the columns are located by name so a
+    # reordering cannot swap symbols and names.
+    for table in tree.xpath('//table[contains(@class, "wikitable")]'):
+        rows = table.xpath(".//tr")
+        header = [th.text_content().strip() for th in rows[0].xpath("./th")] if rows else []
+        if "Symbol" in header and "Security" in header:
+            symbol_col = header.index("Symbol")
+            name_col = header.index("Security")
+            break
+    else:
+        raise RuntimeError(
+            "S&P 500 constituents table with Symbol and Security columns not found on Wikipedia."
+        )
+    symbols = []
+    for row in rows[1:]:
+        cells = row.xpath("./td")
+        if len(cells) <= max(symbol_col, name_col):
+            continue
+        symbols.append({
+            "symbol": cells[symbol_col].text_content().strip(),
+            "name": cells[name_col].text_content().strip(),
+        })
+    if not symbols:
+        raise RuntimeError("No S&P 500 constituents could be parsed from Wikipedia.")
+    write_cache("sp500_symbols", symbols)
+    if resp.headers.get("ETag"):
+        write_cache("wiki_etag", resp.headers["ETag"])
+    return symbols
+
+
+@disk_cached
+async def finnhub_get(client: httpx.AsyncClient, endpoint: str, symbol: str, token: str):
+    """Request `endpoint` for `symbol` from Finnhub and return the decoded JSON.
+
+    Requests are paced by `FINNHUB_RATE_LIMITER`, and transient failures are
+    retried by `get_with_retries`.  Errors are raised to the caller.
+    """
+    url = f"{API_BASE}/{endpoint}"
+    params = {"symbol": symbol, "token": token}
+    resp = await get_with_retries(client, url, FINNHUB_RATE_LIMITER, params=params)
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
 
 
-def fetch_quote(session: requests.Session, symbol: str, token: str) -> float:
+async def fetch_quote(client: httpx.AsyncClient, symbol: str, token: str) -> float:
     """Fetch the latest stock price for a given ticker from Finnhub.
 
     Finnhub’s `/quote` endpoint returns fields including the current price
     (`c`), the previous close (`pc`) and others.  This function returns
     the current price as a float.  If the request fails, it returns `None`.
     """
-    url = f"{API_BASE}/quote"
-    params = {"symbol": symbol, "token": token}
     try:
-        resp = session.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
+        data = await finnhub_get(client, "quote", symbol, token)
         return float(data.get("c"))
     except Exception:
         return None
 
 
-def fetch_last_earnings(session: requests.Session, symbol: str, token: str) -> Dict[str, float]:
-    """Return the most recent earnings surprise for a symbol.
+async def fetch_last_earnings(client: httpx.AsyncClient, symbol: str, token: str) -> Dict[str, float]:
+    """Return the most recent earnings surprise for a symbol if it was good.
 
     The Finnhub `/stock/earnings` endpoint returns a list of earnings
     surprises with fields such as `actual`, `estimate`, `revenueActual` and
-    `revenueEstimate`.  This function returns the first record in the list
-    (assumed to be the most recent quarter) with those four fields converted
-    to floats.  If the response is empty or invalid, `None` is returned.
+    `revenueEstimate`.  The first record in the list is assumed to be the
+    most recent quarter.  A company is considered to have a good earnings
+    result when its actual EPS and revenue both exceed the market estimates;
+    guidance is not available via this API, so only those two conditions are
+    evaluated.  The raw fields are compared before anything else is built,
+    so only good results are returned, with the four fields as decoded from
+    the JSON response.  If the result is not good, any of the four fields is
+    missing or not a number, or the response is empty or invalid, `None` is
+    returned.
     """
-    url = f"{API_BASE}/stock/earnings"
-    params = {"symbol": symbol, "token": token}
     try:
-        resp = session.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        records = resp.json()
+        records = await finnhub_get(client, "stock/earnings", symbol, token)
         if not records:
             return None
         rec = records[0]
+        actual_eps = rec.get("actual")
+        estimate_eps = rec.get("estimate")
+        actual_revenue = rec.get("revenueActual")
+        estimate_revenue = rec.get("revenueEstimate")
+        # A missing or null field means the figure was not reported, so the
+        # record cannot be judged.  JSON numbers already decode to int/float
+        # and are compared as-is.
+        for value in (actual_eps, estimate_eps, actual_revenue, estimate_revenue):
+            if not isinstance(value, (int, float)):
+                return None
+        if not (actual_eps > estimate_eps and actual_revenue > estimate_revenue):
+            return None
         return {
-            "actual_eps": float(rec.get("actual", 0)),
-            "estimate_eps": float(rec.get("estimate", 0)),
-            "actual_revenue": float(rec.get("revenueActual", 0)),
-            "estimate_revenue": float(rec.get("revenueEstimate", 0)),
+            "actual_eps": actual_eps,
+            "estimate_eps": estimate_eps,
+            "actual_revenue": actual_revenue,
+            "estimate_revenue": estimate_revenue,
         }
     except Exception:
         return None
 
 
-def is_good_earnings(record: Dict[str, float]) -> bool:
-    """Determine whether a company meets the "good earnings" criteria.
+class Entry(NamedTuple):
+    """A row of the generated table: one company and its evaluation result."""
+
+    name: str
+    symbol: str
+    price: float
+    good: bool
+
+
+# Static parts of the generated page.  The header holds the CSS styling and
+# the introductory sections; table rows are written between the header and
+# the footer.  The footer's `{year}` placeholder is filled in when the page is
+# written, with `str.replace` so the rest of the page is never scanned for
+# format fields.
+HTML_HEADER = """\
+<!DOCTYPE html>
+<html lang="ja">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>AI広瀬の米国株決算分析</title>
+  <style>
+    body { font-family: 'Helvetica Neue', Arial, sans-serif; margin: 0; padding: 0; background-color: #f7f9fc; color: #333; line-height: 1.6; }
+    header { background: linear-gradient(60deg, #007bff, #0d47a1); color: #fff; padding: 50px 20px; text-align: center; }
+    header h1 { margin: 0; font-size: 2.2rem; }
+    header .tagline { margin-top: 10px; font-size: 1.1rem; opacity: 0.85; }
+    main { max-width: 960px; margin: 0 auto; padding: 40px 20px; }
+    h2 { margin-top: 0; margin-bottom: 15px; color: #0d47a1; border-bottom: 2px solid #007bff; padding-bottom: 4px; font-size: 1.6rem; }
+    section { margin-bottom: 40px; }
+    p { margin-bottom: 20px; font-size: 0.98rem; }
+    ol { margin-left: 20px; margin-bottom: 20px; }
+    ol li { margin-bottom: 5px; }
+    table { width: 100%; border-collapse: collapse; background-color: #fff; box-shadow: 0 2px 4px rgba(0,0,0,0.05); font-size: 0.92rem; }
+    table th, table td { padding: 12px 15px; border-bottom: 1px solid #e0e6ed; vertical-align: middle; }
+    table th { background-color: #f3f6fa; text-align: left; font-weight: 600; }
+    table tbody tr:nth-child(even) { background-color: #fafbfc; }
+    table tbody tr:hover { background-color: #f1f5fa; }
+    .good { color: #27ae60; font-weight: 600; }
+    .no { color: #c0392b; font-weight: 600; }
+    .note { font-size: 0.8rem; color: #666; }
+    footer { text-align: center; padding: 25px 10px; background-color: #f3f6fa; color: #444; font-size: 0.85rem; }
+    footer a { color: #0d47a1; text-decoration: none; }
+  </style>
+</head>
+<body>
+  <header>
+    <h1>AI広瀬の米国株決算分析</h1>
+    <p class="tagline">個人投資家のための米国株情報サイト</p>
+  </header>
+  <main>
+    <section id="about">
+      <h2>サイト概要</h2>
+      <p>当サイトは、S&P500 に含まれる米国株を対象に、決算情報と株価を自動収集し、<strong>良い決算</strong>を出した企業を一覧表示します。広瀬隆雄氏が提唱する『良い決算』の条件に基づいて、最新の EPS と売上高が市場予想を上回った銘柄だけを掲載しています。各行では企業名、ティッカー、現在株価、評価結果を確認できます。</p>
+    </section>
+    <section id="good-earnings">
+      <h2>『良い決算』とは？</h2>
+      <p>広瀬隆雄氏によると、『良い決算』とは次の 3 つの指標がすべて市場予想（コンセンサス）を上回る決算を指します<sup><a href="#cite-hirosekessan">[1]</a></sup>。</p>
+      <ol>
+        <li>EPS（1株当たり利益）</li>
+        <li>売上高</li>
+        <li>会社側ガイダンス（来期・今年度の見通し）</li>
+      </ol>
+      <p>本サイトではガイダンスデータが取得できないため、1 と 2 の条件を満たす企業を『良い決算』としています。</p>
+    </section>
+    <section id="table-section">
+      <h2>良い決算を出した銘柄一覧</h2>
+      <table>
+        <thead>
+          <tr>
+            <th>企業名</th>
+            <th>ティッカー</th>
+            <th>株価（USD）</th>
+            <th>評価結果</th>
+          </tr>
+        </thead>
+        <tbody>
+"""
+
+ROW_TEMPLATE = (
+    "          <tr><td>%s</td><td>%s</td><td>%.2f</td>"
+    "<td class=\"%s\">%s</td></tr>\n"
+)
+# CSS class and label for the evaluation result column.
+GOOD_RESULT = ("good", "良い決算")
+NO_RESULT = ("no", "該当なし")
+
+HTML_FOOTER = """\
+        </tbody>
+      </table>
+      <p class="note">表に表示されているデータは Finnhub API を使用して生成されています。API は RESTful な JSON 形式でレスポンスを返し、すべての GET リクエストで token パラメータが必要です【421114312369163†L139-L154】。API キーの設定方法についてはリポジトリの README を参照してください。</p>
+    </section>
+    <section id="footnotes">
+      <p id="cite-hirosekessan" class="note"><strong>[1]</strong> 良い決算の条件は EPS、売上高、会社ガイダンスが市場予想をすべて上回ること【643053757984928†L296-L304】。</p>
+    </section>
+  </main>
+  <footer>
+    <p>&copy; {year} AI広瀬の米国株決算分析. All rights reserved.</p>
+  </footer>
+</body>
+</html>
+"""
+
+
+def write_html(entries: List[Entry], fileobj) -> None:
+    """Write the HTML for the main page to `fileobj` from a list of entries.
 
-    A company is considered to have a good earnings result when its actual
-    EPS and revenue both exceed the market estimates.  Guidance is not
-    available via this API, so only the first two conditions are evaluated.
+    Each entry is an `Entry` with `name`, `symbol`, `price` and `good`
+    fields.  This function produces an HTML page mirroring the stylish design
+    previously created, writing the static header, one table row per entry
+    and the footer in turn rather than assembling the whole document in
+    memory.  Company names and symbols are HTML-escaped, so characters such
+    as `&` or `<` cannot break the markup.
     """
-    return (
-        record["actual_eps"] > record["estimate_eps"]
-        and record["actual_revenue"] > record["estimate_revenue"]
+    # Bind the template and helpers locally so the generator reads them from
+    # closure cells rather than looking up module globals for every row.
+    row, esc, good, no = ROW_TEMPLATE, escape, GOOD_RESULT, NO_RESULT
+    fileobj.write(HTML_HEADER)
+    fileobj.writelines(
+        row % ((esc(entry.name), esc(entry.symbol), entry.price) + (good if entry.good else no))
+        for entry in entries
     )
+    fileobj.write(HTML_FOOTER.replace("{year}", str(datetime.now().year)))
 
 
-def build_html(entries: List[Dict[str, any]]) -> str:
-    """Construct an HTML string for the main page from a list of entries.
+async def fetch_symbol(
+    client: httpx.AsyncClient, sem: asyncio.Semaphore, symbol: str, token: str
+) -> Dict[str, object]:
+    """Fetch the quote and latest earnings for one symbol together.
 
-    Each entry should have `name`, `symbol`, `price` and `good` fields.  This
-    function produces an HTML page mirroring the stylish design previously
-    created, and populates the table rows using the provided entries.
+    Both requests run concurrently under a single semaphore slot and share
+    the client's pooled connections.  The result is a dict with `quote` and
+    `earnings` keys holding the values returned by `fetch_quote` and
+    `fetch_last_earnings`.
     """
-    # HTML header and CSS styling
-    html_parts = [
-        "<!DOCTYPE html>",
-        "<html lang=\"ja\">",
-        "<head>",
-        "  <meta charset=\"UTF-8\">",
-        "  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">",
-        "  <title>AI広瀬の米国株決算分析</title>",
-        "  <style>",
-        "    body { font-family: 'Helvetica Neue', Arial, sans-serif; margin: 0; padding: 0; background-color: #f7f9fc; color: #333; line-height: 1.6; }",
-        "    header { background: linear-gradient(60deg, #007bff, #0d47a1); color: #fff; padding: 50px 20px; text-align: center; }",
-        "    header h1 { margin: 0; font-size: 2.2rem; }",
-        "    header .tagline { margin-top: 10px; font-size: 1.1rem; opacity: 0.85; }",
-        "    main { max-width: 960px; margin: 0 auto; padding: 40px 20px; }",
-        "    h2 { margin-top: 0; margin-bottom: 15px; color: #0d47a1; border-bottom: 2px solid #007bff; padding-bottom: 4px; font-size: 1.6rem; }",
-        "    section { margin-bottom: 40px; }",
-        "    p { margin-bottom: 20px; font-size: 0.98rem; }",
-        "    ol { margin-left: 20px; margin-bottom: 20px; }",
-        "    ol li { margin-bottom: 5px; }",
-        "    table { width: 100%; border-collapse: collapse; background-color: #fff; box-shadow: 0 2px 4px rgba(0,0,0,0.05); font-size: 0.92rem; }",
-        "    table th, table td { padding: 12px 15px; border-bottom: 1px solid #e0e6ed; vertical-align: middle; }",
-        "    table th { background-color: #f3f6fa; text-align: left; font-weight: 600; }",
-        "    table tbody tr:nth-child(even) { background-color: #fafbfc; }",
-        "    table tbody tr:hover { background-color: #f1f5fa; }",
-        "    .good { color: #27ae60; font-weight: 600; }",
-        "    .no { color: #c0392b; font-weight: 600; }",
-        "    .note { font-size: 0.8rem; color: #666; }",
-        "    footer { text-align: center; padding: 25px 10px; background-color: #f3f6fa; color: #444; font-size: 0.85rem; }",
-        "    footer a { color: #0d47a1; text-decoration: none; }",
-        "  </style>",
-        "</head>",
-        "<body>",
-        "  <header>",
-        "    <h1>AI広瀬の米国株決算分析</h1>",
-        "    <p class=\"tagline\">個人投資家のための米国株情報サイト</p>",
-        "  </header>",
-        "  <main>",
-        "    <section id=\"about\">",
-        "      <h2>サイト概要</h2>",
-        "      <p>当サイトは、S&P500 に含まれる米国株を対象に、決算情報と株価を自動収集し、<strong>良い決算</strong>を出した企業を一覧表示します。広瀬隆雄氏が提唱する『良い決算』の条件に基づいて、最新の EPS と売上高が市場予想を上回った銘柄だけを掲載しています。各行では企業名、ティッカー、現在株価、評価結果を確認できます。</p>",
-        "    </section>",
-        "    <section id=\"good-earnings\">",
-        "      <h2>『良い決算』とは？</h2>",
-        "      <p>広瀬隆雄氏によると、『良い決算』とは次の 3 つの指標がすべて市場予想（コンセンサス）を上回る決算を指します<sup><a href=\"#cite-hirosekessan\">[1]</a></sup>。</p>",
-        "      <ol>",
-        "        <li>EPS（1株当たり利益）</li>",
-        "        <li>売上高</li>",
-        "        <li>会社側ガイダンス（来期・今年度の見通し）</li>",
-        "      </ol>",
-        "      <p>本サイトではガイダンスデータが取得できないため、1 と 2 の条件を満たす企業を『良い決算』としています。</p>",
-        "    </section>",
-        "    <section id=\"table-section\">",
-        "      <h2>良い決算を出した銘柄一覧</h2>",
-        "      <table>",
-        "        <thead>",
-        "          <tr>",
-        "            <th>企業名</th>",
-        "            <th>ティッカー</th>",
-        "            <th>株価（USD）</th>",
-        "            <th>評価結果</th>",
-        "          </tr>",
-        "        </thead>",
-        "        <tbody>"
-    ]
-
-    for entry in entries:
-        # Determine class for the evaluation result
-        cls = "good" if entry["good"] else "no"
-        result_text = "良い決算" if entry["good"] else "該当なし"
-        html_parts.append(
-            f"          <tr><td>{entry['name']}</td><td>{entry['symbol']}</td><td>{entry['price']:.2f}</td><td class=\"{cls}\">{result_text}</td></tr>"
+    async with sem:
+        quote, earnings = await asyncio.gather(
+            fetch_quote(client, symbol, token),
+            fetch_last_earnings(client, symbol, token),
         )
+    return {"quote": quote, "earnings": earnings}
 
-    html_parts.extend([
-        "        </tbody>",
-        "      </table>",
-        "      <p class=\"note\">表に表示されているデータは Finnhub API を使用して生成されています。API は RESTful な JSON 形式でレスポンスを返し、すべての GET リクエストで token パラメータが必要です【421114312369163†L139-L154】。API キーの設定方法についてはリポジトリの README を参照してください。</p>",
-        "    </section>",
-        "    <section id=\"footnotes\">",
-        "      <p id=\"cite-hirosekessan\" class=\"note\"><strong>[1]</strong> 良い決算の条件は EPS、売上高、会社ガイダンスが市場予想をすべて上回ること【643053757984928†L296-L304】。</p>",
-        "    </section>",
-        "  </main>",
-        "  <footer>",
-        "    <p>&copy; {year} AI広瀬の米国株決算分析. All rights reserved.</p>",
-        "  </footer>",
-        "</body>",
-        "</html>"
-    ])
-    return "\n".join(html_parts).format(year=datetime.now().year)
+
+async def warm_up(client: httpx.AsyncClient) -> None:
+    """Open a pooled connection to Finnhub ahead of the first real request.
+
+    A `HEAD` request resolves DNS and completes the TLS handshake so the
+    connection is ready for reuse.  Any error is ignored; the real requests
+    will report it.
+    """
+    try:
+        await client.head(API_BASE)
+    except Exception:
+        pass
+
+
+async def fetch_all(token: str) -> Tuple[List[Dict[str, str]], List[Dict[str, object]]]:
+    """Load the S&P 500 constituents and fetch their data concurrently.
+
+    The constituents are loaded while a connection to Finnhub is being warmed
+    up, so the two latencies overlap.  All requests share a single HTTP/2
+    `httpx` client whose pool holds at most `MAX_CONNECTIONS` connections.
+    The result is the constituents list together with the dicts returned by
+    `fetch_symbol`, in the same order.
+    """
+    # Each symbol issues two requests, so half as many symbols as the
+    # request limit may be in flight at once.
+    sem = asyncio.Semaphore(MAX_CONCURRENCY // 2)
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_TIMEOUT,
+    )
+    # httpx sets Accept-Encoding itself from the decoders it has available,
+    # adding `br` only when the `brotli` package (`httpx[brotli]`) is installed.
+    async with httpx.AsyncClient(
+        http2=True, limits=limits, timeout=REQUEST_TIMEOUT
+    ) as client:
+        sp500, _ = await asyncio.gather(get_sp500_symbols(client), warm_up(client))
+        results = await asyncio.gather(
+            *(fetch_symbol(client, sem, item["symbol"], token) for item in sp500)
+        )
+    return sp500, results
 
 
 def main():
@@ -242,29 +568,32 @@ def main():
             "FINNHUB_API_KEY environment variable not set. Please supply your Finnhub API key."
         )
 
-    session = requests.Session()
-
-    sp500 = get_sp500_symbols()
+    try:
+        sp500, results = asyncio.run(fetch_all(token))
+    finally:
+        # Closing the cache database checkpoints its write-ahead log into the
+        # main database file, including after a failed run.  The cached
+        # connection is cleared so a later call opens a fresh one.
+        cache_db().close()
+        cache_db.cache_clear()
     entries = []
-    for item in sp500:
+    for item, result in zip(sp500, results):
         symbol = item["symbol"]
         name = item["name"]
-        quote = fetch_quote(session, symbol, token)
-        earnings = fetch_last_earnings(session, symbol, token)
+        quote = result["quote"]
+        earnings = result["earnings"]
+        # fetch_last_earnings only returns good earnings results.
         if quote is None or earnings is None:
             continue
-        good = is_good_earnings(earnings)
-        if good:
-            entries.append({"name": name, "symbol": symbol, "price": quote, "good": good})
+        entries.append(Entry(name, symbol, quote, True))
 
     # Sort entries alphabetically for consistency
-    entries.sort(key=lambda e: e["symbol"])
+    entries.sort(key=operator.attrgetter("symbol"))
 
-    html = build_html(entries)
     # Write to index.html in the site directory
     output_path = os.path.join(os.path.dirname(__file__), "index.html")
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+        write_html(entries, f)
     print(f"Generated HTML for {len(entries)} companies with good earnings.")
 
 